@@ -2,18 +2,50 @@ import pandas as pd
 import numpy as np
 import io
 import streamlit as st
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+
+# Excel cell formats shared by every sheet of the export
+_HEADER_FORMAT = {"bold": True, "align": "center"}
+_TITLE_FORMAT = {"bold": True}
+
+def _write_df_to_sheet(writer, sheet_name, df, header_fmt, startrow=0):
+    """
+    Write a dataframe with a formatted header row to an Excel sheet.
+    
+    Args:
+        writer: pandas ExcelWriter using the xlsxwriter engine
+        sheet_name: Name of the sheet, created if missing
+        df: DataFrame to write, without its index
+        header_fmt: Workbook format applied to the header cells
+        startrow: Row of the header (0-based)
+        
+    Returns:
+        int: First row after the written data
+    """
+    df.to_excel(writer, sheet_name=sheet_name, startrow=startrow + 1, header=False, index=False)
+    writer.sheets[sheet_name].write_row(startrow, 0, df.columns, header_fmt)
+    return startrow + len(df) + 1
 
 class TournamentManager:
+    _TEAM_COLS = ["Nome squadra", "Referente", "Contatto", "Quota pagata", "Note"]
+    _MATCH_COLS = ["Squadra 1", "Squadra 2", "Set Squadra 1", "Set Squadra 2", "Vincitore"]
+    _PLAYOFF_COLS = ["Fase"] + _MATCH_COLS
+    _SET_DTYPES = {"Set Squadra 1": "Int8", "Set Squadra 2": "Int8"}  # Nullable, NA until played
+
     def __init__(self):
         """Initialize the tournament manager with empty dataframes for teams, matches, and standings."""
-        self.teams = pd.DataFrame(columns=["Nome squadra", "Referente", "Contatto", "Quota pagata", "Note"])
+        self._teams_rows = []  # Registered teams, one dict per team
+        self._team_names = set()  # Registered team names, for duplicate checks
+        self._teams_df = None  # DataFrame view of the teams, built on demand
         self.groups = {}  # Dictionary to store team assignments to groups
+        self._team_cat = None  # Categorical dtype of team names, set by create_groups
         self.matches = {}  # Dictionary to store match schedules by group
-        self.playoffs = pd.DataFrame(columns=["Fase", "Squadra 1", "Squadra 2", "Set Squadra 1", "Set Squadra 2", "Vincitore"])
+        self._matches_version = {}  # Bumped on every results update, by group
+        self._standings_cache = {}  # (matches version, standings) by group
+        self._groups_complete_cache = None  # Last check_groups_complete result, None when stale
+        self.playoffs = pd.DataFrame(columns=self._PLAYOFF_COLS)
+        self._playoffs_complete_cache = None  # Last check_playoffs_complete result, None when stale
         self.final_standings = pd.DataFrame(columns=["Posizione", "Nome squadra"])
+        self._excel_cache = None  # Last export_to_excel bytes, None when stale
         
         # Tournament settings
         self.points_win = 3
@@ -35,21 +67,34 @@ class TournamentManager:
             bool: True if team was added successfully, False if team already exists
         """
         # Check if team already exists
-        if name in self.teams["Nome squadra"].values:
+        if name in self._team_names:
             return False
         
         # Add the team
-        new_team = pd.DataFrame({
-            "Nome squadra": [name],
-            "Referente": [contact_person],
-            "Contatto": [contact_info],
-            "Quota pagata": [payment_status],
-            "Note": [notes]
+        self._teams_rows.append({
+            "Nome squadra": name,
+            "Referente": contact_person,
+            "Contatto": contact_info,
+            "Quota pagata": payment_status,
+            "Note": notes
         })
-        
-        self.teams = pd.concat([self.teams, new_team], ignore_index=True)
+        self._team_names.add(name)
+        self._teams_df = None
+        self._excel_cache = None
         return True
     
+    @property
+    def teams(self):
+        """
+        Registered teams as a DataFrame.
+        
+        Returns:
+            DataFrame: One row per team, built once after each registration
+        """
+        if self._teams_df is None:
+            self._teams_df = pd.DataFrame(self._teams_rows, columns=self._TEAM_COLS)
+        return self._teams_df
+    
     def create_groups(self, num_groups, teams_per_group):
         """
         Create tournament groups by distributing teams.
@@ -61,43 +106,43 @@ class TournamentManager:
         # Reset existing groups
         self.groups = {}
         self.matches = {}
+        self._standings_cache = {}
+        self._groups_complete_cache = None
+        self._excel_cache = None
         
-        # Get team names
-        team_names = self.teams["Nome squadra"].tolist()
-        
-        # Shuffle teams to randomize group assignments
-        np.random.shuffle(team_names)
+        # Team name columns of the matches are stored as codes of this dtype
+        team_names = self.teams["Nome squadra"].to_numpy()
+        self._team_cat = pd.CategoricalDtype(categories=team_names)
         
-        # Create groups (A, B, C, etc.)
-        group_names = [chr(65 + i) for i in range(num_groups)]  # A, B, C, ...
+        # Shuffle team names to randomize group assignments
+        team_names = np.random.default_rng().permutation(team_names)
         
-        # Assign teams to groups
-        for i, group in enumerate(group_names):
+        # Assign teams to groups (A, B, C, etc.)
+        for i in range(num_groups):
             start_idx = i * teams_per_group
-            end_idx = start_idx + teams_per_group
             
             if start_idx < len(team_names):
-                self.groups[group] = team_names[start_idx:min(end_idx, len(team_names))]
+                self.groups[chr(65 + i)] = team_names[start_idx:start_idx + teams_per_group].tolist()
     
     def generate_matches(self):
         """Generate round-robin match schedules for each group."""
         self.matches = {}
+        self._standings_cache = {}
+        self._groups_complete_cache = None
+        self._excel_cache = None
         
         for group, teams in self.groups.items():
-            matches = []
-            
-            # Generate round-robin schedule
-            for i in range(len(teams)):
-                for j in range(i + 1, len(teams)):
-                    matches.append({
-                        "Squadra 1": teams[i],
-                        "Squadra 2": teams[j],
-                        "Set Squadra 1": None,
-                        "Set Squadra 2": None,
-                        "Vincitore": ""
-                    })
-            
-            self.matches[group] = pd.DataFrame(matches)
+            # Generate round-robin schedule: every pair (i, j) with i < j
+            team_arr = np.asarray(teams, dtype=object)
+            first, second = np.triu_indices(len(teams), k=1)
+            
+            self.matches[group] = pd.DataFrame({
+                "Squadra 1": pd.Categorical(team_arr[first], dtype=self._team_cat),
+                "Squadra 2": pd.Categorical(team_arr[second], dtype=self._team_cat),
+                "Set Squadra 1": pd.NA,
+                "Set Squadra 2": pd.NA,
+                "Vincitore": ""
+            }, columns=self._MATCH_COLS).astype(self._SET_DTYPES)
     
     def update_match_results(self, group, updated_df):
         """
@@ -108,25 +153,21 @@ class TournamentManager:
             updated_df: DataFrame with updated match results
         """
         # Update match data
-        self.matches[group] = updated_df.copy()
-        
-        # Calculate winners
-        for idx, row in self.matches[group].iterrows():
-            team1_sets = row["Set Squadra 1"]
-            team2_sets = row["Set Squadra 2"]
-            
-            # Skip if results not entered yet
-            if pd.isna(team1_sets) or pd.isna(team2_sets):
-                self.matches[group].at[idx, "Vincitore"] = ""
-                continue
-            
-            # Determine winner
-            if team1_sets > team2_sets:
-                self.matches[group].at[idx, "Vincitore"] = row["Squadra 1"]
-            elif team2_sets > team1_sets:
-                self.matches[group].at[idx, "Vincitore"] = row["Squadra 2"]
-            else:
-                self.matches[group].at[idx, "Vincitore"] = "Draw"
+        # Only whole columns are replaced below, so the editor's buffers can be shared
+        self.matches[group] = updated_df.astype(self._SET_DTYPES, copy=False)
+        self._matches_version[group] = self._matches_version.get(group, 0) + 1
+        self._groups_complete_cache = None
+        self._excel_cache = None
+        df = self.matches[group]
+        
+        # Calculate winners, leaving matches without results blank
+        s1 = df["Set Squadra 1"]
+        s2 = df["Set Squadra 2"]
+        valid = (s1.notna() & s2.notna()).to_numpy()
+        team1_won = (s1 > s2).to_numpy(dtype=bool, na_value=False)
+        team2_won = (s2 > s1).to_numpy(dtype=bool, na_value=False)
+        winner = np.where(team1_won, df["Squadra 1"], np.where(team2_won, df["Squadra 2"], "Draw"))
+        df["Vincitore"] = np.where(valid, winner, "")
     
     def calculate_group_standings(self, group):
         """
@@ -141,70 +182,51 @@ class TournamentManager:
         if group not in self.matches:
             return pd.DataFrame()
         
+        # Reuse the last standings if the results have not changed since
+        version = self._matches_version.get(group, 0)
+        cached = self._standings_cache.get(group)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
         matches_df = self.matches[group]
         teams = self.groups[group]
         
-        # Initialize standings dataframe
+        # Only matches with results count towards the standings
+        played = matches_df.dropna(subset=["Set Squadra 1", "Set Squadra 2"])
+        sets1 = played["Set Squadra 1"].to_numpy(dtype=int)
+        sets2 = played["Set Squadra 2"].to_numpy(dtype=int)
+        
+        # Row of each team in the standings, looked up once per match side
+        team_rows = pd.Index(teams)
+        rows = np.concatenate([
+            team_rows.get_indexer(played["Squadra 1"]),
+            team_rows.get_indexer(played["Squadra 2"])
+        ])
+        
+        # Each match seen from both teams' side, aligned with rows
+        sets_won = np.concatenate([sets1, sets2])
+        sets_lost = np.concatenate([sets2, sets1])
+        wins = sets_won > sets_lost
+        losses = sets_lost > sets_won
+        
+        # Award points (3 for win, 0 for loss, 1 for tiebreak loss, e.g. 2-3)
+        tiebreak = (sets_won == sets_lost - 1) & (sets_lost == 3)
+        points = np.where(wins, self.points_win, np.where(losses, np.where(tiebreak, self.points_tiebreak, self.points_loss), 0))
+        
+        # Accumulate per team, keeping teams that have not played yet
+        def tally(values=None):
+            return np.bincount(rows, weights=values, minlength=len(teams)).astype(int)
+        
         standings = pd.DataFrame({
             "Team": teams,
-            "Matches Played": 0,
-            "Wins": 0,
-            "Losses": 0,
-            "Sets Won": 0,
-            "Sets Lost": 0,
-            "Points": 0
+            "Matches Played": tally(),
+            "Wins": tally(wins),
+            "Losses": tally(losses),
+            "Sets Won": tally(sets_won),
+            "Sets Lost": tally(sets_lost),
+            "Points": tally(points)
         })
         
-        # Process each match
-        for _, match in matches_df.iterrows():
-            team1 = match["Squadra 1"]
-            team2 = match["Squadra 2"]
-            sets1 = match["Set Squadra 1"]
-            sets2 = match["Set Squadra 2"]
-            
-            # Skip if match results not entered
-            if pd.isna(sets1) or pd.isna(sets2):
-                continue
-            
-            # Update team 1 statistics
-            team1_idx = standings[standings["Team"] == team1].index[0]
-            standings.at[team1_idx, "Matches Played"] += 1
-            standings.at[team1_idx, "Sets Won"] += sets1
-            standings.at[team1_idx, "Sets Lost"] += sets2
-            
-            # Update team 2 statistics
-            team2_idx = standings[standings["Team"] == team2].index[0]
-            standings.at[team2_idx, "Matches Played"] += 1
-            standings.at[team2_idx, "Sets Won"] += sets2
-            standings.at[team2_idx, "Sets Lost"] += sets1
-            
-            # Update wins, losses, and points
-            if sets1 > sets2:
-                standings.at[team1_idx, "Wins"] += 1
-                standings.at[team2_idx, "Losses"] += 1
-                
-                # Award points (3 for win, 0 for loss, 1 for tiebreak loss)
-                standings.at[team1_idx, "Points"] += self.points_win
-                
-                # Check for tiebreak loss (e.g., 3-2)
-                if sets2 == sets1 - 1 and sets1 == 3:
-                    standings.at[team2_idx, "Points"] += self.points_tiebreak
-                else:
-                    standings.at[team2_idx, "Points"] += self.points_loss
-                    
-            elif sets2 > sets1:
-                standings.at[team2_idx, "Wins"] += 1
-                standings.at[team1_idx, "Losses"] += 1
-                
-                # Award points
-                standings.at[team2_idx, "Points"] += self.points_win
-                
-                # Check for tiebreak loss
-                if sets1 == sets2 - 1 and sets2 == 3:
-                    standings.at[team1_idx, "Points"] += self.points_tiebreak
-                else:
-                    standings.at[team1_idx, "Points"] += self.points_loss
-        
         # Sort standings by points (descending), then by set difference
         standings["Set Difference"] = standings["Sets Won"] - standings["Sets Lost"]
         standings = standings.sort_values(by=["Points", "Set Difference", "Sets Won"], ascending=False)
@@ -212,6 +234,7 @@ class TournamentManager:
         # Drop the set difference column (used only for sorting)
         standings = standings.drop(columns=["Set Difference"])
         
+        self._standings_cache[group] = (version, standings)
         return standings
     
     def check_groups_complete(self):
@@ -224,11 +247,14 @@ class TournamentManager:
         if not self.matches:
             return False
         
-        for group, matches_df in self.matches.items():
-            if matches_df["Set Squadra 1"].isna().any() or matches_df["Set Squadra 2"].isna().any():
-                return False
+        # Matches only change through generate_matches / update_match_results
+        if self._groups_complete_cache is None:
+            self._groups_complete_cache = all(
+                not matches_df[["Set Squadra 1", "Set Squadra 2"]].isna().any().any()
+                for matches_df in self.matches.values()
+            )
         
-        return True
+        return self._groups_complete_cache
     
     def generate_playoffs(self, teams_advancing):
         """
@@ -247,7 +273,7 @@ class TournamentManager:
         
         total_teams = len(qualified_teams)
         
-        # Calculate playoff structure
+        # Calculate playoff structure, one _PLAYOFF_COLS tuple per match
         if total_teams >= 8:
             # Quarterfinals
             num_quarters = 4
@@ -261,53 +287,17 @@ class TournamentManager:
                     team1 = qualified_teams[team1_idx][1]
                     team2 = qualified_teams[team2_idx][1]
                     
-                    phases.append({
-                        "Fase": "Quarterfinals",
-                        "Squadra 1": team1,
-                        "Squadra 2": team2,
-                        "Set Squadra 1": None,
-                        "Set Squadra 2": None,
-                        "Vincitore": ""
-                    })
+                    phases.append(("Quarterfinals", team1, team2, pd.NA, pd.NA, ""))
             
             # Semifinals
-            phases.append({
-                "Fase": "Semifinals",
-                "Squadra 1": "QF1 Winner",
-                "Squadra 2": "QF2 Winner",
-                "Set Squadra 1": None,
-                "Set Squadra 2": None,
-                "Vincitore": ""
-            })
-            
-            phases.append({
-                "Fase": "Semifinals",
-                "Squadra 1": "QF3 Winner",
-                "Squadra 2": "QF4 Winner",
-                "Set Squadra 1": None,
-                "Set Squadra 2": None,
-                "Vincitore": ""
-            })
+            phases.append(("Semifinals", "QF1 Winner", "QF2 Winner", pd.NA, pd.NA, ""))
+            phases.append(("Semifinals", "QF3 Winner", "QF4 Winner", pd.NA, pd.NA, ""))
             
             # Finals
-            phases.append({
-                "Fase": "Finals",
-                "Squadra 1": "SF1 Winner",
-                "Squadra 2": "SF2 Winner",
-                "Set Squadra 1": None,
-                "Set Squadra 2": None,
-                "Vincitore": ""
-            })
+            phases.append(("Finals", "SF1 Winner", "SF2 Winner", pd.NA, pd.NA, ""))
             
             # Third place match
-            phases.append({
-                "Fase": "Third Place",
-                "Squadra 1": "SF1 Loser",
-                "Squadra 2": "SF2 Loser",
-                "Set Squadra 1": None,
-                "Set Squadra 2": None,
-                "Vincitore": ""
-            })
+            phases.append(("Third Place", "SF1 Loser", "SF2 Loser", pd.NA, pd.NA, ""))
             
         elif total_teams >= 4:
             # Semifinals only
@@ -319,48 +309,22 @@ class TournamentManager:
                     team1 = qualified_teams[team1_idx][1]
                     team2 = qualified_teams[team2_idx][1]
                     
-                    phases.append({
-                        "Fase": "Semifinals",
-                        "Squadra 1": team1,
-                        "Squadra 2": team2,
-                        "Set Squadra 1": None,
-                        "Set Squadra 2": None,
-                        "Vincitore": ""
-                    })
+                    phases.append(("Semifinals", team1, team2, pd.NA, pd.NA, ""))
             
             # Finals
-            phases.append({
-                "Fase": "Finals",
-                "Squadra 1": "SF1 Winner",
-                "Squadra 2": "SF2 Winner",
-                "Set Squadra 1": None,
-                "Set Squadra 2": None,
-                "Vincitore": ""
-            })
+            phases.append(("Finals", "SF1 Winner", "SF2 Winner", pd.NA, pd.NA, ""))
             
             # Third place match
-            phases.append({
-                "Fase": "Third Place",
-                "Squadra 1": "SF1 Loser",
-                "Squadra 2": "SF2 Loser",
-                "Set Squadra 1": None,
-                "Set Squadra 2": None,
-                "Vincitore": ""
-            })
+            phases.append(("Third Place", "SF1 Loser", "SF2 Loser", pd.NA, pd.NA, ""))
             
         else:
             # Just finals
             if len(qualified_teams) >= 2:
-                phases.append({
-                    "Fase": "Finals",
-                    "Squadra 1": qualified_teams[0][1],
-                    "Squadra 2": qualified_teams[1][1],
-                    "Set Squadra 1": None,
-                    "Set Squadra 2": None,
-                    "Vincitore": ""
-                })
-        
-        self.playoffs = pd.DataFrame(phases)
+                phases.append(("Finals", qualified_teams[0][1], qualified_teams[1][1], pd.NA, pd.NA, ""))
+        
+        self.playoffs = pd.DataFrame(phases, columns=self._PLAYOFF_COLS).astype(self._SET_DTYPES)
+        self._playoffs_complete_cache = None
+        self._excel_cache = None
     
     def update_playoff_results(self, updated_df):
         """
@@ -369,61 +333,37 @@ class TournamentManager:
         Args:
             updated_df: DataFrame with updated playoff match results
         """
-        self.playoffs = updated_df.copy()
-        
-        # Calculate winners and update next round matches
-        for idx, row in self.playoffs.iterrows():
-            team1_sets = row["Set Squadra 1"]
-            team2_sets = row["Set Squadra 2"]
-            phase = row["Fase"]
-            
-            # Skip if results not entered yet
-            if pd.isna(team1_sets) or pd.isna(team2_sets):
-                self.playoffs.at[idx, "Vincitore"] = ""
-                continue
-            
-            # Determine winner
-            winner = ""
-            loser = ""
-            if team1_sets > team2_sets:
-                winner = row["Squadra 1"]
-                loser = row["Squadra 2"]
-            elif team2_sets > team1_sets:
-                winner = row["Squadra 2"]
-                loser = row["Squadra 1"]
-            
-            self.playoffs.at[idx, "Vincitore"] = winner
-            
-            # Propagate winners to next round
-            if phase == "Quarterfinals":
-                qf_number = idx + 1  # QF1, QF2, etc.
-                
-                # Find semifinals that reference this quarterfinal
-                for sf_idx, sf_row in self.playoffs[self.playoffs["Fase"] == "Semifinals"].iterrows():
-                    if f"QF{qf_number} Winner" in [sf_row["Squadra 1"], sf_row["Squadra 2"]]:
-                        if sf_row["Squadra 1"] == f"QF{qf_number} Winner":
-                            self.playoffs.at[sf_idx, "Squadra 1"] = winner
-                        else:
-                            self.playoffs.at[sf_idx, "Squadra 2"] = winner
-            
-            elif phase == "Semifinals":
-                sf_number = 1 if idx == min(self.playoffs[self.playoffs["Fase"] == "Semifinals"].index) else 2
-                
-                # Update finals
-                for final_idx, final_row in self.playoffs[self.playoffs["Fase"] == "Finals"].iterrows():
-                    if f"SF{sf_number} Winner" in [final_row["Squadra 1"], final_row["Squadra 2"]]:
-                        if final_row["Squadra 1"] == f"SF{sf_number} Winner":
-                            self.playoffs.at[final_idx, "Squadra 1"] = winner
-                        else:
-                            self.playoffs.at[final_idx, "Squadra 2"] = winner
-                
-                # Update third place match
-                for third_idx, third_row in self.playoffs[self.playoffs["Fase"] == "Third Place"].iterrows():
-                    if f"SF{sf_number} Loser" in [third_row["Squadra 1"], third_row["Squadra 2"]]:
-                        if third_row["Squadra 1"] == f"SF{sf_number} Loser":
-                            self.playoffs.at[third_idx, "Squadra 1"] = loser
-                        else:
-                            self.playoffs.at[third_idx, "Squadra 2"] = loser
+        # Only whole columns are replaced below, so the editor's buffers can be shared
+        self.playoffs = updated_df.astype(self._SET_DTYPES, copy=False)
+        self._playoffs_complete_cache = None
+        self._excel_cache = None
+        df = self.playoffs
+        
+        # Calculate winners and losers, leaving matches without results blank
+        s1 = df["Set Squadra 1"]
+        s2 = df["Set Squadra 2"]
+        valid = (s1.notna() & s2.notna()).to_numpy()
+        team1_won = (s1 > s2).to_numpy(dtype=bool, na_value=False)
+        team2_won = (s2 > s1).to_numpy(dtype=bool, na_value=False)
+        winners = np.where(team1_won, df["Squadra 1"], np.where(team2_won, df["Squadra 2"], ""))
+        losers = np.where(team1_won, df["Squadra 2"], np.where(team2_won, df["Squadra 1"], ""))
+        df["Vincitore"] = np.where(valid, winners, "")
+        
+        # Map next-round placeholders ("QF1 Winner", "SF2 Loser", ...) to teams
+        phase_rows = df.groupby("Fase").indices  # Row positions by phase
+        placeholders = {}
+        for pos in phase_rows.get("Quarterfinals", []):
+            if valid[pos]:
+                placeholders[f"QF{df.index[pos] + 1} Winner"] = winners[pos]
+        for i, pos in enumerate(phase_rows.get("Semifinals", [])):
+            if valid[pos]:
+                sf_number = 1 if i == 0 else 2
+                placeholders[f"SF{sf_number} Winner"] = winners[pos]
+                placeholders[f"SF{sf_number} Loser"] = losers[pos]
+        
+        # Propagate winners to next round
+        if placeholders:
+            df[["Squadra 1", "Squadra 2"]] = df[["Squadra 1", "Squadra 2"]].replace(placeholders)
     
     def check_playoffs_complete(self):
         """
@@ -435,7 +375,11 @@ class TournamentManager:
         if self.playoffs.empty:
             return False
         
-        return not (self.playoffs["Set Squadra 1"].isna().any() or self.playoffs["Set Squadra 2"].isna().any())
+        # Playoffs only change through generate_playoffs / update_playoff_results
+        if self._playoffs_complete_cache is None:
+            self._playoffs_complete_cache = not self.playoffs[["Set Squadra 1", "Set Squadra 2"]].isna().any().any()
+        
+        return self._playoffs_complete_cache
     
     def generate_final_standings(self):
         """Generate final tournament standings based on playoff results."""
@@ -476,16 +420,20 @@ class TournamentManager:
         
         # Add the remaining teams from group stage
         pos = len(positions) + 1
+        placed = {p["Nome squadra"] for p in positions}
         for group in self.groups.keys():
+            # Cached since generate_playoffs unless the group's results changed
             standings = self.calculate_group_standings(group)
             
             # Skip teams that already appear in playoffs
-            for _, team in enumerate(standings["Team"]):
-                if not any(p["Nome squadra"] == team for p in positions):
+            for team in standings["Team"].tolist():
+                if team not in placed:
                     positions.append({"Posizione": pos, "Nome squadra": team})
+                    placed.add(team)
                     pos += 1
         
         self.final_standings = pd.DataFrame(positions)
+        self._excel_cache = None
     
     def export_to_excel(self):
         """
@@ -494,68 +442,49 @@ class TournamentManager:
         Returns:
             BytesIO: Excel file as bytes
         """
-        output = io.BytesIO()
-        
-        # Create workbook
-        wb = Workbook()
+        # Reuse the last workbook if nothing changed since it was built
+        if self._excel_cache is not None:
+            return io.BytesIO(self._excel_cache)
         
-        # Create registration sheet
-        ws_reg = wb.active
-        ws_reg.title = "Iscrizioni"
+        output = io.BytesIO()
         
-        # Helper function to write dataframe to worksheet
-        def write_df_to_sheet(sheet, df):
-            for r in dataframe_to_rows(df, index=False, header=True):
-                sheet.append(r)
+        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+            # Formats are registered once per workbook and reused for every sheet
+            header_fmt = writer.book.add_format(_HEADER_FORMAT)
+            title_fmt = writer.book.add_format(_TITLE_FORMAT)
             
-            # Format header row
-            for cell in sheet[1]:
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal="center")
-        
-        # Write registrations
-        write_df_to_sheet(ws_reg, self.teams)
-        
-        # Write groups and matches
-        for group, teams in self.groups.items():
-            # Create group sheet
-            ws_group = wb.create_sheet(f"Girone {group}")
+            # Write registrations
+            _write_df_to_sheet(writer, "Iscrizioni", self.teams, header_fmt)
             
-            # Write team list
-            teams_df = pd.DataFrame({"Squadre": teams})
-            write_df_to_sheet(ws_group, teams_df)
-            
-            # Add separator row
-            ws_group.append([])
-            
-            # Write matches
-            if group in self.matches:
-                start_row = ws_group.max_row + 1
-                write_df_to_sheet(ws_group, self.matches[group])
-            
-            # Add separator row
-            ws_group.append([])
-            
-            # Write standings
-            standings = self.calculate_group_standings(group)
-            if not standings.empty:
-                start_row = ws_group.max_row + 1
-                ws_group.append(["Classifica"])
-                ws_group.cell(row=start_row, column=1).font = Font(bold=True)
-                write_df_to_sheet(ws_group, standings)
-        
-        # Write playoffs
-        if not self.playoffs.empty:
-            ws_playoffs = wb.create_sheet("Fasi Finali")
-            write_df_to_sheet(ws_playoffs, self.playoffs)
-        
-        # Write final standings
-        if not self.final_standings.empty:
-            ws_standings = wb.create_sheet("Classifica Finale")
-            write_df_to_sheet(ws_standings, self.final_standings)
-        
-        # Save to BytesIO
-        wb.save(output)
+            # Write groups and matches
+            for group, teams in self.groups.items():
+                sheet_name = f"Girone {group}"
+                
+                # Write team list
+                row = _write_df_to_sheet(writer, sheet_name, pd.DataFrame({"Squadre": teams}), header_fmt)
+                
+                # Add separator row, then write matches
+                row += 1
+                if group in self.matches:
+                    row = _write_df_to_sheet(writer, sheet_name, self.matches[group], header_fmt, row)
+                
+                # Add separator row, then write standings
+                row += 1
+                # Cached unless the group's results changed
+                standings = self.calculate_group_standings(group)
+                if not standings.empty:
+                    writer.sheets[sheet_name].write(row, 0, "Classifica", title_fmt)
+                    _write_df_to_sheet(writer, sheet_name, standings, header_fmt, row + 1)
+            
+            # Write playoffs
+            if not self.playoffs.empty:
+                _write_df_to_sheet(writer, "Fasi Finali", self.playoffs, header_fmt)
+            
+            # Write final standings
+            if not self.final_standings.empty:
+                _write_df_to_sheet(writer, "Classifica Finale", self.final_standings, header_fmt)
+        
+        self._excel_cache = output.getvalue()
         output.seek(0)
         
         return output